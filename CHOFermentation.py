@@ -7,12 +7,295 @@
 ### Ersteller/-in: Milena Rühmann, Christian Stehno
 ### Datum: 13.06.2025
 
+import math
+
+import numba
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
 
+# Untergrenze für den Aktivitätseffekt: verhindert bei extremen
+# Umgebungsbedingungen den Unterlauf des Gauß-Produkts auf 0.0 (und
+# damit eine Division durch null) und begrenzt zugleich die Sterberate
+# auf einen endlichen Wert
+_MIN_ACTIVITY = 1e-26
+
+
+@numba.njit(cache=True, fastmath=True)
+def _rhs(glucose_c, vcd_c, const_activity, max_growth_rate,
+         substrate_affinity, yield_coefficient, maintenance_coefficient,
+         base_death_rate, antibody_productivity, inv_inhibition,
+         opt_glucose, sigma_glucose):
+    """Rechte Seite des Fermentations-ODE-Systems.
+
+    Zustand: Glukose, VCD, tote Zellen, Antikörper-Titer. Der
+    konstante Umgebungsanteil des Gauß-Stressmodells wird vorab
+    berechnet übergeben; hier variiert nur der Glukose-Faktor.
+    """
+    # Zwischenzustände der RK-Stufen können leicht unter 0 schießen;
+    # wie beim Euler-Schritt werden negative Konzentrationen geklemmt
+    glucose_c = max(0.0, glucose_c)
+    vcd_c = max(0.0, vcd_c)
+
+    # Bewertet aktuelle Umgebungsbedingungen (Gauß-Stressmodell); die
+    # Untergrenze hält den Aktivitätseffekt strikt positiv, sodass die
+    # Sterberate auch weit vom Optimum endlich bleibt
+    glucose_activity = math.exp(
+        -0.5 * ((glucose_c - opt_glucose) / sigma_glucose)**2)
+    activity_effect = max(const_activity * glucose_activity,
+                          _MIN_ACTIVITY)
+    death_rate = base_death_rate / activity_effect
+
+    # Berechnet Substratlimitierung nach Haldane-Kinetik
+    # (ausfaktorisiert: S^2/k_i = S * (S * 1/k_i))
+    if glucose_c > 0:
+        substrate_factor = glucose_c / (
+            substrate_affinity + glucose_c *
+            (1.0 + glucose_c * inv_inhibition))
+    else:
+        substrate_factor = 0.0
+
+    # Berechnet aktuelle spezifische Wachstumsrate; der frühere
+    # if-Zweig wird durch eine multiplikative Maske (bool -> float)
+    # ersetzt, sodass der Kern ohne Sprünge kompiliert
+    growth_rate = (max_growth_rate * substrate_factor *
+                   activity_effect * (vcd_c > 0))
+
+    # Zeitableitungen aller vier Zustandsgrößen
+    growth_flux = growth_rate * vcd_c
+    death_flux = death_rate * vcd_c
+    d_glucose = -(growth_flux / yield_coefficient +
+                  maintenance_coefficient * vcd_c)
+    d_vcd = growth_flux - death_flux
+    d_dead = death_flux
+    d_titer = antibody_productivity * vcd_c * activity_effect
+
+    return d_glucose, d_vcd, d_dead, d_titer
+
+
+@numba.njit(cache=True, fastmath=True)
+def _simulate_core(n, dt, initial_glucose, initial_vcd, temperature,
+                   ph, oxygen_saturation, max_growth_rate,
+                   substrate_affinity, yield_coefficient,
+                   maintenance_coefficient, base_death_rate,
+                   antibody_productivity, inhibition_constant,
+                   opt_temp, opt_ph, opt_oxygen, opt_glucose,
+                   sigma_temp, sigma_ph, sigma_oxygen, sigma_glucose):
+    """JIT-kompilierte adaptive RKF45-Integration der Simulation.
+
+    Integriert das ODE-System mit dem eingebetteten Runge-Kutta-
+    Fehlberg-Verfahren 4(5): die Schrittweite wird über die eingebettete
+    Fehlerschätzung gesteuert, sodass ruhige Phasen (Lag, stationär)
+    mit großen Schritten durchlaufen werden. Die Ergebnisse werden per
+    linearer Interpolation auf das äquidistante Ausgaberaster
+    abgetastet; Rückgabe als zusammenhängendes (6, n)-Array in der
+    Reihenfolge Glukose, VCD, TCD, tote Zellen, Viabilität, Titer.
+    """
+    # Ein zusammenhängender Puffer für alle sechs Messgrößen statt
+    # sechs einzelner Allokationen (bessere Cache-Lokalität)
+    out = np.empty((6, n), dtype=np.float64)
+    glucose = out[0]
+    vcd = out[1]
+    tcd = out[2]
+    dead_cells = out[3]
+    viability = out[4]
+    antibody_titer = out[5]
+
+    # Anfangswerte für t=0 setzen (zu Beginn alle Zellen lebendig)
+    glucose[0] = initial_glucose
+    vcd[0] = tcd[0] = initial_vcd
+    dead_cells[0] = 0.0
+    viability[0] = 100.0  # 100% Viabilität am Start
+    antibody_titer[0] = 0.0
+
+    # Temperatur, pH und Sauerstoff sind über die Simulation konstant,
+    # daher wird ihr Anteil am Gauß-Stressmodell einmalig vorab
+    # berechnet; pro Auswertung variiert nur noch der Glukose-Faktor
+    const_activity = math.exp(
+        -0.5 * (((temperature - opt_temp) / sigma_temp)**2 +
+                ((ph - opt_ph) / sigma_ph)**2 +
+                ((oxygen_saturation - opt_oxygen) / sigma_oxygen)**2))
+
+    # Kehrwert der Inhibierungskonstante vorab, spart eine Division
+    # pro Auswertung in der Haldane-Kinetik
+    inv_inhibition = 1.0 / inhibition_constant
+
+    # Aktueller Zustand (Glukose, VCD, tote Zellen, Titer) und Zeit
+    g0 = initial_glucose
+    x0 = initial_vcd
+    d0 = 0.0
+    a0 = 0.0
+    t = 0.0
+    t_end = (n - 1) * dt
+
+    # Schrittweitensteuerung: Sicherheitsfaktor und Grenzen pro
+    # Schritt; bei h_min wird der Schritt notfalls trotz überschrittener
+    # Toleranz akzeptiert, damit steife Extremfälle (sofort absterbende
+    # Kultur) die Schleife nicht in Mikroschritte zwingen
+    h = dt
+    h_max = 8.0 * dt
+    h_min = 1.0e-3 * dt
+    rtol = 1.0e-6
+    atol = 1.0e-9
+
+    i = 1  # nächster zu füllender Ausgabeindex
+    while t < t_end and i < n:
+        if t + h > t_end:
+            h = t_end - t
+
+        # Sechs RKF45-Stufen (Fehlberg-Tableau)
+        k1g, k1x, k1d, k1a = _rhs(
+            g0, x0, const_activity, max_growth_rate,
+            substrate_affinity, yield_coefficient,
+            maintenance_coefficient, base_death_rate,
+            antibody_productivity, inv_inhibition,
+            opt_glucose, sigma_glucose)
+        k2g, k2x, k2d, k2a = _rhs(
+            g0 + h * 0.25 * k1g, x0 + h * 0.25 * k1x,
+            const_activity, max_growth_rate, substrate_affinity,
+            yield_coefficient, maintenance_coefficient,
+            base_death_rate, antibody_productivity, inv_inhibition,
+            opt_glucose, sigma_glucose)
+        k3g, k3x, k3d, k3a = _rhs(
+            g0 + h * (3.0 / 32.0 * k1g + 9.0 / 32.0 * k2g),
+            x0 + h * (3.0 / 32.0 * k1x + 9.0 / 32.0 * k2x),
+            const_activity, max_growth_rate, substrate_affinity,
+            yield_coefficient, maintenance_coefficient,
+            base_death_rate, antibody_productivity, inv_inhibition,
+            opt_glucose, sigma_glucose)
+        k4g, k4x, k4d, k4a = _rhs(
+            g0 + h * (1932.0 / 2197.0 * k1g - 7200.0 / 2197.0 * k2g +
+                      7296.0 / 2197.0 * k3g),
+            x0 + h * (1932.0 / 2197.0 * k1x - 7200.0 / 2197.0 * k2x +
+                      7296.0 / 2197.0 * k3x),
+            const_activity, max_growth_rate, substrate_affinity,
+            yield_coefficient, maintenance_coefficient,
+            base_death_rate, antibody_productivity, inv_inhibition,
+            opt_glucose, sigma_glucose)
+        k5g, k5x, k5d, k5a = _rhs(
+            g0 + h * (439.0 / 216.0 * k1g - 8.0 * k2g +
+                      3680.0 / 513.0 * k3g - 845.0 / 4104.0 * k4g),
+            x0 + h * (439.0 / 216.0 * k1x - 8.0 * k2x +
+                      3680.0 / 513.0 * k3x - 845.0 / 4104.0 * k4x),
+            const_activity, max_growth_rate, substrate_affinity,
+            yield_coefficient, maintenance_coefficient,
+            base_death_rate, antibody_productivity, inv_inhibition,
+            opt_glucose, sigma_glucose)
+        k6g, k6x, k6d, k6a = _rhs(
+            g0 + h * (-8.0 / 27.0 * k1g + 2.0 * k2g -
+                      3544.0 / 2565.0 * k3g + 1859.0 / 4104.0 * k4g -
+                      11.0 / 40.0 * k5g),
+            x0 + h * (-8.0 / 27.0 * k1x + 2.0 * k2x -
+                      3544.0 / 2565.0 * k3x + 1859.0 / 4104.0 * k4x -
+                      11.0 / 40.0 * k5x),
+            const_activity, max_growth_rate, substrate_affinity,
+            yield_coefficient, maintenance_coefficient,
+            base_death_rate, antibody_productivity, inv_inhibition,
+            opt_glucose, sigma_glucose)
+
+        # Lösung 5. Ordnung für alle vier Zustandsgrößen
+        g1 = g0 + h * (16.0 / 135.0 * k1g + 6656.0 / 12825.0 * k3g +
+                       28561.0 / 56430.0 * k4g - 9.0 / 50.0 * k5g +
+                       2.0 / 55.0 * k6g)
+        x1 = x0 + h * (16.0 / 135.0 * k1x + 6656.0 / 12825.0 * k3x +
+                       28561.0 / 56430.0 * k4x - 9.0 / 50.0 * k5x +
+                       2.0 / 55.0 * k6x)
+        d1 = d0 + h * (16.0 / 135.0 * k1d + 6656.0 / 12825.0 * k3d +
+                       28561.0 / 56430.0 * k4d - 9.0 / 50.0 * k5d +
+                       2.0 / 55.0 * k6d)
+        a1 = a0 + h * (16.0 / 135.0 * k1a + 6656.0 / 12825.0 * k3a +
+                       28561.0 / 56430.0 * k4a - 9.0 / 50.0 * k5a +
+                       2.0 / 55.0 * k6a)
+
+        # Eingebettete Fehlerschätzung (Differenz 5. minus 4. Ordnung)
+        eg = h * (1.0 / 360.0 * k1g - 128.0 / 4275.0 * k3g -
+                  2197.0 / 75240.0 * k4g + 1.0 / 50.0 * k5g +
+                  2.0 / 55.0 * k6g)
+        ex = h * (1.0 / 360.0 * k1x - 128.0 / 4275.0 * k3x -
+                  2197.0 / 75240.0 * k4x + 1.0 / 50.0 * k5x +
+                  2.0 / 55.0 * k6x)
+        ed = h * (1.0 / 360.0 * k1d - 128.0 / 4275.0 * k3d -
+                  2197.0 / 75240.0 * k4d + 1.0 / 50.0 * k5d +
+                  2.0 / 55.0 * k6d)
+        ea = h * (1.0 / 360.0 * k1a - 128.0 / 4275.0 * k3a -
+                  2197.0 / 75240.0 * k4a + 1.0 / 50.0 * k5a +
+                  2.0 / 55.0 * k6a)
+
+        # Skalierter Maximumsfehler relativ zur Toleranz
+        err = abs(eg) / (atol + rtol * max(abs(g0), abs(g1)))
+        err = max(err, abs(ex) / (atol + rtol * max(abs(x0), abs(x1))))
+        err = max(err, abs(ed) / (atol + rtol * max(abs(d0), abs(d1))))
+        err = max(err, abs(ea) / (atol + rtol * max(abs(a0), abs(a1))))
+
+        if err <= 1.0 or h <= h_min:
+            # Schritt akzeptiert (bei h_min erzwungen): Zustände
+            # klemmen (nicht unter 0)
+            t_new = t + h
+            g1 = max(0.0, g1)
+            x1 = max(0.0, x1)
+
+            # Tastet alle Ausgabezeitpunkte im Intervall (t, t_new]
+            # per linearer Interpolation ab
+            while i < n and i * dt <= t_new + 1e-12:
+                w = (i * dt - t) / (t_new - t)
+                glucose[i] = max(0.0, g0 + w * (g1 - g0))
+                vcd_i = max(0.0, x0 + w * (x1 - x0))
+                vcd[i] = vcd_i
+                dead_cells[i] = d0 + w * (d1 - d0)
+                tcd[i] = vcd_i + dead_cells[i]
+                if tcd[i] > 0:
+                    viability[i] = vcd_i / tcd[i] * 100
+                else:
+                    viability[i] = 0.0
+                antibody_titer[i] = a0 + w * (a1 - a0)
+                i += 1
+
+            t = t_new
+            g0, x0, d0, a0 = g1, x1, d1, a1
+
+        # Schrittweitenregler: h_neu = 0.9*h*(1/err)^(1/5), begrenzt
+        if err > 1e-300:
+            factor = 0.9 * err**-0.2
+        else:
+            factor = 4.0
+        factor = min(4.0, max(0.2, factor))
+        h = min(h_max, max(h_min, h * factor))
+
+    return out
+
+
+@numba.njit(cache=True, fastmath=True, parallel=True)
+def _simulate_batch(n, dt, initial_glucose, initial_vcd, temperature,
+                    ph, oxygen_saturation, max_growth_rate,
+                    substrate_affinity, yield_coefficient,
+                    maintenance_coefficient, base_death_rate,
+                    antibody_productivity, inhibition_constant,
+                    opt_temp, opt_ph, opt_oxygen, opt_glucose,
+                    sigma_temp, sigma_ph, sigma_oxygen, sigma_glucose):
+    """Führt mehrere unabhängige Simulationsläufe parallel aus.
+
+    Die fünf Startbedingungen werden als Arrays der Länge B übergeben;
+    die Läufe sind voneinander unabhängig und werden über prange auf
+    alle Kerne verteilt. Gibt ein Array der Form (B, 6, n) zurück
+    (Reihenfolge: Glukose, VCD, TCD, tote Zellen, Viabilität, Titer).
+    """
+    runs = initial_glucose.shape[0]
+    out = np.empty((runs, 6, n), dtype=np.float64)
+
+    # Parameter-Sweep: jeder Lauf ist unabhängig -> prange
+    for b in numba.prange(runs):
+        out[b] = _simulate_core(
+            n, dt, initial_glucose[b], initial_vcd[b],
+            temperature[b], ph[b], oxygen_saturation[b],
+            max_growth_rate, substrate_affinity, yield_coefficient,
+            maintenance_coefficient, base_death_rate,
+            antibody_productivity, inhibition_constant,
+            opt_temp, opt_ph, opt_oxygen, opt_glucose,
+            sigma_temp, sigma_ph, sigma_oxygen, sigma_glucose)
+
+    return out
+
 
 class CHOFermentationSimulator:
     """Simuliert CHO-Zellfermentation mit Monod-Kinetik."""
@@ -49,35 +332,39 @@ class CHOFermentationSimulator:
                       'glucose': 40.0}
     
     def stress_gaussian(self, deviation, sigma):
-        """Berechnet die Normalverteilung für die Umgebungsbedingungen."""
-        return np.exp(-0.5 * (deviation / sigma)**2)
+        """Berechnet die Normalverteilung für die Umgebungsbedingungen.
+
+        Nutzt math.exp, da der skalare Aufruf den Ufunc-Dispatch von
+        np.exp umgeht.
+        """
+        return math.exp(-0.5 * (deviation / sigma)**2)
     
     def evaluate_environment(self, temperature, ph, oxygen_saturation,
                              glucose):
         """Bewertet Umgebungsbedingungen und berechnet Effekte.
-        
+
         Berechnet sowohl positive Aktivitätseffekte als auch
-        negative Stresseffekte auf die Zellen.
+        negative Stresseffekte auf die Zellen. Das Produkt der vier
+        Gauß-Faktoren wird als Summe der quadrierten, standardisierten
+        Abweichungen in einem einzigen exp ausgewertet; der
+        Stresseffekt ist dessen Kehrwert.
         """
-        # Abweichungen von optimalen Bedingungen berechnen
-        deviations = {
-            'temp': temperature - self.optimal['temp'],
-            'ph': ph - self.optimal['ph'],
-            'oxygen': oxygen_saturation - self.optimal['oxygen'],
-            'glucose': glucose - self.optimal['glucose']
-        }
-        
-        # Berechnet multiplikativen Aktivitätseffekt auf Wachstum
-        activity_factors = [self.stress_gaussian(dev, self.sigma[key])
-                           for key, dev in deviations.items()]
-        activity_effect = np.prod(activity_factors)
-        
-        # Berechnet Stresseffekt für erhöhte Sterberate
-        stress_factors = [1.0 / self.stress_gaussian(dev, self.sigma[key])
-                         for key, dev in deviations.items()]
-        combined_stress = np.prod(stress_factors)
-        
-        return activity_effect, self.death_rate * combined_stress
+        # Optima und Toleranzen einmalig in lokale Variablen holen
+        optimal = self.optimal
+        sigma = self.sigma
+
+        # Summe der quadrierten Abweichungen von den Optima
+        z = (((temperature - optimal['temp']) / sigma['temp'])**2 +
+             ((ph - optimal['ph']) / sigma['ph'])**2 +
+             ((oxygen_saturation - optimal['oxygen'])
+              / sigma['oxygen'])**2 +
+             ((glucose - optimal['glucose']) / sigma['glucose'])**2)
+
+        # Untergrenze wie im JIT-Kern: verhindert Unterlauf auf 0.0
+        # (und damit eine Division durch null) bei Extremwerten
+        activity_effect = max(math.exp(-0.5 * z), _MIN_ACTIVITY)
+
+        return activity_effect, self.death_rate / activity_effect
     
     def monod_kinetics(self, substrate, k_s, k_i=None):
         """Implementiert Monod- oder Haldane-Kinetik.
@@ -96,87 +383,101 @@ class CHOFermentationSimulator:
         # Haldane-Kinetik mit Substratinhibierung bei hohen Konzentrationen
         return substrate / (k_s + substrate + (substrate**2 / k_i))
     
+    def simulate_raw(self, initial_glucose, initial_vcd, temperature,
+                     ph_constant, oxygen_saturation):
+        """Führt die Simulation durch und gibt den Rohpuffer zurück.
+
+        Liefert das (6, n)-Array des JIT-Kerns (Glukose, VCD, TCD,
+        tote Zellen, Viabilität, Titer) ohne Pandas-Überbau; die
+        DataFrame-Konvertierung kann so auf den Zeitpunkt der
+        Darstellung verschoben werden.
+        """
+        n = len(self.time_points)
+
+        # Entpackt alle Modellparameter als Skalare für den JIT-Kern
+        return _simulate_core(
+            n, self.time_step, initial_glucose, initial_vcd,
+            temperature, ph_constant, oxygen_saturation,
+            *self._model_params())
+
     def simulate(self, initial_glucose, initial_vcd, temperature,
                  ph_constant, oxygen_saturation):
         """Führt die Hauptfermentationssimulation durch.
-        
+
         Berechnet zeitliche Entwicklung aller Kultivierungsparameter
-        mittels numerischer Integration (Euler-Verfahren).
+        mittels numerischer Integration (adaptives RKF45-Verfahren)
+        und gibt sie als strukturierten DataFrame zurück.
+        """
+        out = self.simulate_raw(initial_glucose, initial_vcd,
+                                temperature, ph_constant,
+                                oxygen_saturation)
+        return self._build_dataframe(out, temperature, ph_constant,
+                                     oxygen_saturation)
+
+    def simulate_many(self, param_df):
+        """Führt mehrere Simulationen parallel über alle Kerne durch.
+
+        Args:
+            param_df: DataFrame mit den Spalten 'initial_glucose',
+                'initial_vcd', 'temperature', 'ph' und 'oxygen';
+                jede Zeile definiert einen unabhängigen Lauf.
+
+        Returns:
+            Liste von DataFrames, ein Ergebnis pro Zeile von param_df.
         """
         n = len(self.time_points)
-        
-        # Initialisiert Datenarrays für alle Messgrößen
-        keys = ['glucose', 'vcd', 'tcd', 'dead_cells', 'viability',
-                'antibody_titer']
-        data = {k: np.zeros(n) for k in keys}
-        
-        # Setzt Anfangswerte für t=0 (zu Beginn alle Zellen lebendig)
-        data['glucose'][0] = initial_glucose
-        data['vcd'][0] = data['tcd'][0] = initial_vcd
-        data['viability'][0] = 100.0  # 100% Viabilität am Start
-        
-        # Hauptsimulationsschleife mit numerischer Integration (Euler)
-        for i in range(1, n):
-            dt = self.time_step
-            prev_glucose = data['glucose'][i-1]
-            prev_vcd = data['vcd'][i-1]
-            
-            # Bewertet aktuelle Umgebungsbedingungen
-            activity_effect, death_rate = self.evaluate_environment(
-                temperature, ph_constant, oxygen_saturation, prev_glucose)
-            
-            # Berechnet Substratlimitierung nach Monod/Haldane
-            substrate_factor = self.monod_kinetics(
-                prev_glucose, self.substrate_affinity,
-                self.inhibition_constant)
-            
-            # Berechnet aktuelle spezifische Wachstumsrate
-            growth_rate = (self.max_growth_rate * substrate_factor *
-                          activity_effect if prev_vcd > 0 else 0)
-            
-            # Aktualisiert Zellkonzentrationen (Euler-Integration)
-            vcd_growth = growth_rate * prev_vcd * dt
-            vcd_death = death_rate * prev_vcd * dt
-            
-            # Neue lebende Zellzahl (nicht unter 0)
-            vcd_current = max(0, prev_vcd + vcd_growth - vcd_death)
-            data['vcd'][i] = vcd_current
-            
-            # Akkumuliert tote Zellen (sterben nicht ab)
-            data['dead_cells'][i] = data['dead_cells'][i-1] + vcd_death
-            data['tcd'][i] = vcd_current + data['dead_cells'][i]
-            
-            # Berechnet Viabilität als Anteil lebender Zellen
-            data['viability'][i] = (vcd_current / data['tcd'][i] * 100 
-                                   if data['tcd'][i] > 0 else 0)
-            
-            # Aktualisiert Glukoseverbrauch für Wachstum + Erhaltung
-            glucose_consumption = (vcd_growth / self.yield_coefficient +
-                                 self.maintenance_coefficient * prev_vcd * dt)
-            data['glucose'][i] = max(0, prev_glucose - glucose_consumption)
-            
-            # Berechnet Antikörperproduktion durch lebende Zellen
-            if vcd_current > 0:
-                antibody_production = (self.antibody_productivity *
-                                     vcd_current * dt * activity_effect)
-                data['antibody_titer'][i] = (
-                    data['antibody_titer'][i-1] + antibody_production)
-            else:
-                # Keine Produktion ohne lebende Zellen
-                data['antibody_titer'][i] = data['antibody_titer'][i-1]
-        
-        # Erstellt strukturierten DataFrame mit gerundeten Werten
-        return pd.DataFrame({
-            'Zeit (h)': np.round(self.time_points, 2),
-            'Glukose (g/L)': np.round(data['glucose'], 2),
-            'VCD (10^6 Zellen/mL)': np.round(data['vcd'], 2),
-            'TCD (10^6 Zellen/mL)': np.round(data['tcd'], 2),
-            'Viabilität (%)': np.round(data['viability'], 2),
-            'Antikörper-Titer (µg/mL)': np.round(data['antibody_titer'], 2),
-            'Temperatur (°C)': np.full(n, temperature),
-            'pH': np.full(n, ph_constant),
-            'Sauerstoff (%)': np.full(n, oxygen_saturation),
-        })
+
+        # Startbedingungen als zusammenhängende float64-Arrays
+        init_glucose = param_df['initial_glucose'].to_numpy(np.float64)
+        init_vcd = param_df['initial_vcd'].to_numpy(np.float64)
+        temperature = param_df['temperature'].to_numpy(np.float64)
+        ph = param_df['ph'].to_numpy(np.float64)
+        oxygen = param_df['oxygen'].to_numpy(np.float64)
+
+        out = _simulate_batch(
+            n, self.time_step, init_glucose, init_vcd, temperature,
+            ph, oxygen, *self._model_params())
+
+        # Baut pro Lauf denselben Ergebnis-DataFrame wie simulate()
+        return [self._build_dataframe(out[b], temperature[b], ph[b],
+                                      oxygen[b])
+                for b in range(out.shape[0])]
+
+    def _model_params(self):
+        """Stellt die Modellparameter als Skalar-Tupel für Numba bereit."""
+        return (self.max_growth_rate, self.substrate_affinity,
+                self.yield_coefficient, self.maintenance_coefficient,
+                self.death_rate, self.antibody_productivity,
+                self.inhibition_constant,
+                self.optimal['temp'], self.optimal['ph'],
+                self.optimal['oxygen'], self.optimal['glucose'],
+                self.sigma['temp'], self.sigma['ph'],
+                self.sigma['oxygen'], self.sigma['glucose'])
+
+    def _build_dataframe(self, out, temperature, ph_constant,
+                         oxygen_saturation):
+        """Baut den Ergebnis-DataFrame aus dem (6, n)-Simulationspuffer.
+
+        Die Werte bleiben ungerundet; die Rundung auf zwei
+        Nachkommastellen ist reine Anzeigeformatierung und passiert
+        erst bei der Darstellung. Die konstanten Prozessbedingungen
+        werden nicht als n-lange Spalten materialisiert, sondern als
+        Metadaten in df.attrs abgelegt. Da alle Spalten float64-Arrays
+        sind, übernimmt Pandas sie mit copy=False ohne Blockkopien
+        direkt aus dem Numba-Puffer.
+        """
+        df = pd.DataFrame({
+            'Zeit (h)': self.time_points,
+            'Glukose (g/L)': out[0],
+            'VCD (10^6 Zellen/mL)': out[1],
+            'TCD (10^6 Zellen/mL)': out[2],
+            'Viabilität (%)': out[4],
+            'Antikörper-Titer (µg/mL)': out[5],
+        }, copy=False)
+        df.attrs['temperature'] = temperature
+        df.attrs['ph'] = ph_constant
+        df.attrs['oxygen'] = oxygen_saturation
+        return df
 
 
 def combine_legends(ax1, ax2, loc='upper right'):
@@ -190,59 +491,65 @@ def combine_legends(ax1, ax2, loc='upper right'):
     ax1.legend(lines1 + lines2, labels1 + labels2, loc=loc)
 
 
-def create_plots(data):
+def create_plots(time_points, out):
     """Erstellt wissenschaftliche Visualisierungen der Fermentationsdaten.
-    
-    Generiert drei subplot-Grafiken für verschiedene Aspekte:
+
+    Arbeitet direkt auf dem (6, n)-Rohpuffer der Simulation, ohne
+    DataFrame-Zwischenschritt. Generiert drei subplot-Grafiken:
     1. Zellwachstum und Viabilität, 2. Substratverbrauch, 3. Produktbildung
     """
+    # Reduziert dichte Zeitreihen vor dem Plotten: mehr als ~500
+    # Punkte sind bei der Plotbreite optisch nicht unterscheidbar,
+    # verlangsamen aber das Matplotlib-Rendering linear
+    if out.shape[1] > 500:
+        stride = out.shape[1] // 500
+        time_points = time_points[::stride]
+        out = out[:, ::stride]
+
     # Konvertiert Stunden in Tage für bessere Lesbarkeit der Achsen
-    time_days = data['Zeit (h)'] / 24.0
-    fig, axes = plt.subplots(3, 1, figsize=(12, 10))
+    time_days = time_points / 24.0
+    glucose, vcd, tcd, viability, antibody_titer = (
+        out[0], out[1], out[2], out[4], out[5])
+    # Gemeinsame x-Achse: Ticks und Limits werden nur einmal
+    # berechnet, die x-Beschriftung erscheint nur unten
+    fig, axes = plt.subplots(3, 1, figsize=(12, 10), sharex=True)
 
     # Plot 1: Zellwachstum und Viabilität über Zeit
-    axes[0].plot(time_days, data['VCD (10^6 Zellen/mL)'], 'g-',
-                 label='VCD', linewidth=2)
-    axes[0].plot(time_days, data['TCD (10^6 Zellen/mL)'], 'orange',
-                 label='TCD', linewidth=2)
-    
+    axes[0].plot(time_days, vcd, 'g-', label='VCD', linewidth=2)
+    axes[0].plot(time_days, tcd, 'orange', label='TCD', linewidth=2)
+
     # Sekundäre y-Achse für Viabilität (unterschiedliche Einheit)
     ax0_twin = axes[0].twinx()
-    ax0_twin.plot(time_days, data['Viabilität (%)'], 'purple',
+    ax0_twin.plot(time_days, viability, 'purple',
                   label='Viabilität (%)', linewidth=2)
-    
+
     # Achsenbeschriftungen und Formatierung
     axes[0].set_ylabel('Zellkonzentration (10⁶ Zellen/mL)')
     ax0_twin.set_ylabel('Viabilität (%)')
     axes[0].set_title('Zellwachstum und Viabilität')
-    axes[0].set_xlabel('Zeit (Tage)')
-    axes[0].set_xlim(0, 12)  # 12 Tage Darstellung
     axes[0].grid(True, alpha=0.3)
     combine_legends(axes[0], ax0_twin)
 
     # Plot 2: Glukoseverbrauch gekoppelt mit Zellwachstum
-    axes[1].plot(time_days, data['Glukose (g/L)'], 'b-',
-                 label='Glukose', linewidth=2)
+    axes[1].plot(time_days, glucose, 'b-', label='Glukose', linewidth=2)
     ax1_twin = axes[1].twinx()
-    ax1_twin.plot(time_days, data['VCD (10^6 Zellen/mL)'], 'g--',
-                  label='VCD', linewidth=1.5, alpha=0.7)
-    
+    ax1_twin.plot(time_days, vcd, 'g--', label='VCD', linewidth=1.5,
+                  alpha=0.7)
+
     # Zweite y-Achse für VCD zur Korrelationsdarstellung
     axes[1].set_ylabel('Glukose (g/L)')
     ax1_twin.set_ylabel('VCD (10⁶ Zellen/mL)')
     axes[1].set_title('Substratverbrauch')
-    axes[1].set_xlabel('Zeit (Tage)')
-    axes[1].set_xlim(0, 12)
     axes[1].grid(True, alpha=0.3)
     combine_legends(axes[1], ax1_twin)
 
     # Plot 3: Antikörperproduktion als Hauptzielgröße
-    axes[2].plot(time_days, data['Antikörper-Titer (µg/mL)'], 'r-',
+    axes[2].plot(time_days, antibody_titer, 'r-',
                  label='Antikörper-Titer', linewidth=2)
     axes[2].set_ylabel('Antikörper-Titer (µg/mL)')
     axes[2].set_title('Antikörperproduktion')
     axes[2].set_xlabel('Zeit (Tage)')
-    axes[2].set_xlim(0, 12)
+    axes[2].set_xlim(0, 12)  # 12 Tage Darstellung, gilt für alle Achsen
     axes[2].legend()
     axes[2].grid(True, alpha=0.3)
 
@@ -251,6 +558,67 @@ def create_plots(data):
     return fig
 
 
+def dataframe_hash(data):
+    """Berechnet einen stabilen Inhalts-Hash eines DataFrames.
+
+    Dient als Cache-Schlüssel für die Figur-Caches, damit identische
+    Daten bei Streamlit-Reruns keine neuen Plots erzeugen.
+    """
+    return hash(pd.util.hash_pandas_object(data).values.tobytes())
+
+
+def array_hash(values):
+    """Berechnet einen stabilen Inhalts-Hash eines NumPy-Arrays."""
+    return hash(values.tobytes())
+
+
+@st.cache_resource
+def build_plots(data_hash, _time_points, _out):
+    """Cached Wrapper um create_plots.
+
+    Der Unterstrich schließt die Arrays vom Hashing aus; der
+    Inhalts-Hash wird explizit als Schlüssel übergeben. Vermeidet den
+    Matplotlib-Neuaufbau bei jedem Rerun (Tab-Wechsel, Widgets).
+    """
+    return create_plots(_time_points, _out)
+
+
+@st.cache_resource
+def build_heatmap(results_hash, _param_to_kpi):
+    """Erstellt die Korrelations-Heatmap, gecached über den Datenhash.
+
+    Gleiches Muster wie build_plots: die Figur wird nur neu gebaut,
+    wenn sich die Vergleichstabelle tatsächlich geändert hat. Die
+    Heatmap wird direkt mit imshow und Text-Annotationen gezeichnet,
+    was für die kleine Parameter-x-KPI-Matrix deutlich leichter ist
+    als der Seaborn-Aufbau.
+    """
+    values = _param_to_kpi.values
+    rows, cols = values.shape
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    image = ax.imshow(values, cmap='RdBu_r', vmin=-1, vmax=1,
+                      aspect='auto')
+
+    # Achsenbeschriftung aus den DataFrame-Labels
+    ax.set_xticks(range(cols))
+    ax.set_xticklabels(_param_to_kpi.columns, rotation=45, ha='right')
+    ax.set_yticks(range(rows))
+    ax.set_yticklabels(_param_to_kpi.index)
+
+    # Zellwerte annotieren; helle Schrift auf dunklen Extremfarben
+    for i in range(rows):
+        for j in range(cols):
+            value = values[i, j]
+            color = 'white' if abs(value) > 0.6 else 'black'
+            ax.text(j, i, f'{value:.2f}', ha='center', va='center',
+                    color=color)
+
+    fig.colorbar(image, ax=ax, label='Korrelation')
+    fig.tight_layout()
+    return fig
+
+
 def nummer_eingabe(label, value, fmt="%.2f", step=0.1, min_value=0.0):
     """Hilfsfunktion für einheitliche Streamlit number_input Erstellung.
     
@@ -261,20 +629,68 @@ def nummer_eingabe(label, value, fmt="%.2f", step=0.1, min_value=0.0):
                           min_value=min_value)
 
 
-def calculate_kpis(data):
-    """Berechnet Key Performance Indicators aus Simulationsdaten.
-    
-    Extrahiert wichtigste Kennzahlen für Prozessbewertung:
-    Endtiter, maximale Zelldichte, Viabilitätsstatistiken.
+def calculate_kpis(out):
+    """Berechnet Key Performance Indicators aus dem Simulationspuffer.
+
+    Extrahiert wichtigste Kennzahlen für Prozessbewertung direkt aus
+    dem (6, n)-Rohpuffer: Endtiter, maximale Zelldichte,
+    Viabilitätsstatistiken.
     """
     return {
-        'final_titer': data['Antikörper-Titer (µg/mL)'].iloc[-1],
-        'max_vcd': data['VCD (10^6 Zellen/mL)'].max(),
-        'avg_viability': data['Viabilität (%)'].mean(),
-        'min_viability': data['Viabilität (%)'].min()
+        'final_titer': out[5, -1],
+        'max_vcd': out[1].max(),
+        'avg_viability': out[4].mean(),
+        'min_viability': out[4].min()
     }
 
 
+@st.cache_resource
+def get_simulator(duration=288, time_step=1.0):
+    """Liefert eine gecachte Simulator-Instanz.
+
+    Der Simulator ist zustandslos über Läufe hinweg; das Zeitraster
+    und die Parameter-Dicts werden so nur einmal pro Konfiguration
+    aufgebaut statt bei jedem Streamlit-Rerun.
+    """
+    return CHOFermentationSimulator(duration, time_step)
+
+
+@st.cache_data
+def run_simulation(initial_glucose, initial_vcd, temperature,
+                   ph_constant, oxygen_saturation, duration=288,
+                   time_step=1.0):
+    """Führt die Simulation aus und cached den Rohpuffer.
+
+    Streamlit memoisiert das (6, n)-Ergebnisarray über die
+    Eingabeparameter, sodass wiederholte Parameterkombinationen (und
+    Reruns durch Widget-Interaktionen) die Simulation nicht erneut
+    ausführen. Die teurere DataFrame-Konvertierung übernimmt
+    get_result_dataframe erst bei Bedarf.
+    """
+    simulator = get_simulator(duration, time_step)
+    return simulator.simulate_raw(initial_glucose, initial_vcd,
+                                  temperature, ph_constant,
+                                  oxygen_saturation)
+
+
+@st.cache_data
+def get_result_dataframe(initial_glucose, initial_vcd, temperature,
+                         ph_constant, oxygen_saturation, duration=288,
+                         time_step=1.0):
+    """Liefert das Simulationsergebnis als DataFrame, lazy und gecached.
+
+    Greift über run_simulation auf den bereits berechneten Rohpuffer
+    zu; der Pandas-Aufbau fällt damit nur an, wenn die Tabellenansicht
+    ihn tatsächlich braucht.
+    """
+    out = run_simulation(initial_glucose, initial_vcd, temperature,
+                         ph_constant, oxygen_saturation, duration,
+                         time_step)
+    simulator = get_simulator(duration, time_step)
+    return simulator._build_dataframe(out, temperature, ph_constant,
+                                      oxygen_saturation)
+
+
 def main():
     """Hauptfunktion für die Streamlit-Anwendung.
     
@@ -295,13 +711,12 @@ def main():
         st.image(logo_url, use_container_width=True)
     
     # Initialisiert Session State für persistente Datenhaltung
-    if 'data' not in st.session_state:
-        st.session_state.data = None
-    if 'results_df' not in st.session_state:
-        st.session_state.results_df = pd.DataFrame()
-    
-    # Erstellt Simulator-Instanz mit Standardparametern
-    simulator = CHOFermentationSimulator()
+    if 'raw' not in st.session_state:
+        st.session_state.raw = None
+    if 'params' not in st.session_state:
+        st.session_state.params = None
+    if 'results_list' not in st.session_state:
+        st.session_state.results_list = []
     
     # Sidebar für strukturierte Parametereingabe
     with st.sidebar:
@@ -324,39 +739,42 @@ def main():
         # "Simulation starten"-Button mit Fortschrittsanzeige
         if st.button("Simulation starten", type="primary"):
             with st.spinner("Simulation läuft..."):
-                # Führt Hauptsimulation mit eingegebenen Parametern durch
-                st.session_state.data = simulator.simulate(
+                # Führt Hauptsimulation mit eingegebenen Parametern
+                # durch (gecached über die Parameterkombination); der
+                # Rohpuffer und die Parameter landen im Session State,
+                # die DataFrame-Ansicht wird erst in Tab 2 gebaut
+                st.session_state.raw = run_simulation(
                     initial_glucose, initial_vcd, temperature,
                     ph_constant, oxygen_saturation)
-                
+                st.session_state.params = (
+                    initial_glucose, initial_vcd, temperature,
+                    ph_constant, oxygen_saturation)
+
                 # Berechnet KPIs und speichert Ergebnisse für Vergleich
-                kpis = calculate_kpis(st.session_state.data)
+                kpis = calculate_kpis(st.session_state.raw)
                 
-                # Erstellt neuen Ergebnisdatensatz für Vergleichstabelle
-                new_result = pd.DataFrame({
-                    'Anfangs-Glukose (g/L)': [initial_glucose],
-                    'Anfangs-VCD (10^6 Zellen/mL)': [initial_vcd],
-                    'Temperatur (°C)': [temperature],
-                    'pH': [ph_constant],
-                    'Sauerstoff (%)': [oxygen_saturation],
-                    'Antikörper-Gesamtausbeute (mg)': [kpis['final_titer']],
-                    'Max VCD (10^6 Zellen/mL)': [kpis['max_vcd']],
-                    'Durchschn. Viabilität (%)': [kpis['avg_viability']]
+                # Hängt neuen Ergebnisdatensatz als Dict an die Liste
+                # an; der Vergleichs-DataFrame wird erst beim Rendern
+                # gebaut (vermeidet quadratische concat-Kopien)
+                st.session_state.results_list.append({
+                    'Anfangs-Glukose (g/L)': initial_glucose,
+                    'Anfangs-VCD (10^6 Zellen/mL)': initial_vcd,
+                    'Temperatur (°C)': temperature,
+                    'pH': ph_constant,
+                    'Sauerstoff (%)': oxygen_saturation,
+                    'Antikörper-Gesamtausbeute (mg)': kpis['final_titer'],
+                    'Max VCD (10^6 Zellen/mL)': kpis['max_vcd'],
+                    'Durchschn. Viabilität (%)': kpis['avg_viability']
                 })
-                
-                # Fügt neues Ergebnis zur Vergleichstabelle hinzu
-                st.session_state.results_df = pd.concat(
-                    [st.session_state.results_df, new_result],
-                    ignore_index=True)
             
             st.success("Simulation abgeschlossen!")
         
         st.divider()
     
     # Hauptinhaltsbereich mit Tab-Navigation nach Simulation
-    if st.session_state.data is not None:
-        data = st.session_state.data
-        kpis = calculate_kpis(data)
+    if st.session_state.raw is not None:
+        raw = st.session_state.raw
+        kpis = calculate_kpis(raw)
         
         # Strukturiert Ergebnisse in übersichtlichen Tabs
         tab1, tab2, tab3 = st.tabs(["Zeitverläufe", "Daten", "Ergebnisse"])
@@ -365,8 +783,10 @@ def main():
         with tab1:
             col1, col2 = st.columns([3, 1])
             with col1:
-                # Erstellt und zeigt wissenschaftliche Plots
-                fig = create_plots(data)
+                # Erstellt und zeigt wissenschaftliche Plots (gecached
+                # über den Inhalts-Hash der Simulationsdaten)
+                fig = build_plots(array_hash(raw),
+                                  get_simulator().time_points, raw)
                 st.pyplot(fig)
             with col2:
                 # KPI-Dashboard neben den Plots für schnelle Bewertung
@@ -381,25 +801,34 @@ def main():
                     
         # Tab 2: Tabellarische Rohdaten-Darstellung
         with tab2:
-            # Zeigt reduzierte Daten (alle 6h) für bessere Übersicht
+            # Baut den DataFrame erst hier aus dem Rohpuffer (lazy,
+            # gecached) und zeigt reduzierte Daten (alle 6h) für
+            # bessere Übersicht; Rundung nur in der Anzeige
+            data = get_result_dataframe(*st.session_state.params)
             display_data = data.iloc[::6]
-            st.dataframe(display_data, use_container_width=True,
-                        hide_index=True)
+            st.dataframe(display_data.style.format('{:.2f}'),
+                        use_container_width=True, hide_index=True)
         
         # Tab 3: Vergleichsanalyse mehrerer Simulationsläufe
         with tab3:
-            if not st.session_state.results_df.empty:
+            if st.session_state.results_list:
                 st.subheader("Simulationsergebnisse")
-                
-                # Fügt Laufnummer für bessere Orientierung hinzu
-                display_results = st.session_state.results_df.copy()
+
+                # Baut den Vergleichs-DataFrame erst hier aus der
+                # Ergebnisliste (eine Allokation statt concat pro Lauf)
+                results_df = pd.DataFrame(st.session_state.results_list)
+
+                # Fügt Laufnummer für bessere Orientierung hinzu;
+                # Rundung auf zwei Nachkommastellen nur in der Anzeige
+                display_results = results_df.copy()
                 display_results.insert(0, 'Nr.', range(1,
                                        len(display_results) + 1))
-                st.dataframe(display_results, use_container_width=True,
-                            hide_index=True)
-                
+                st.dataframe(display_results.style.format(
+                                 '{:.2f}', subset=results_df.columns),
+                            use_container_width=True, hide_index=True)
+
                 # Zeigt Korrelationsanalyse bei mehreren Simulationsläufen
-                if len(st.session_state.results_df) > 1:
+                if len(results_df) > 1:
                     st.subheader("Parameter-KPI Korrelationen")
                     
                     # Definiert Input-Parameter und Output-KPIs
@@ -410,20 +839,16 @@ def main():
                                 'Max VCD (10^6 Zellen/mL)',
                                 'Durchschn. Viabilität (%)']
                     
-                    # Berechnet Korrelationsmatrix zwischen Parametern und KPIs
-                    corr_data = st.session_state.results_df[parameters +
-                                                           kpis_cols]
-                    param_kpi_corr = corr_data.corr()
-                    param_to_kpi = param_kpi_corr.loc[parameters, kpis_cols]
-                    
+                    # Berechnet nur die benötigten Kreuzkorrelationen
+                    # Parameter x KPI statt der vollen (P+K)x(P+K)-Matrix
+                    param_to_kpi = pd.DataFrame(
+                        {k: results_df[parameters].corrwith(results_df[k])
+                         for k in kpis_cols})
+
                     # Erstellt Heatmap für Korrelationsvisualisierung
-                    fig1, ax1 = plt.subplots(figsize=(10, 6))
-                    sns.heatmap(param_to_kpi, annot=True, cmap='RdBu_r',
-                               center=0, fmt='.2f', ax=ax1,
-                               cbar_kws={'label': 'Korrelation'})
-                    plt.xticks(rotation=45, ha='right')
-                    plt.yticks(rotation=0)
-                    plt.tight_layout()
+                    # (gecached über den Hash der Vergleichstabelle)
+                    fig1 = build_heatmap(dataframe_hash(results_df),
+                                         param_to_kpi)
                     st.pyplot(fig1)
             else:
                 st.info("Führen Sie mehrere Simulationen durch, um "